@@ -0,0 +1,132 @@
+# Shared ornament geometry for the animated card (convert_gif_to_svg.py) and
+# the static menu (render_svg.py).
+#
+# Everything here depends only on dimensions, so generators are memoized:
+# batch or server renders build each piece of static geometry once. Paths use
+# compact number formatting and implicit repeated L commands.
+from functools import lru_cache
+
+# Noise texture and metallic border gradient used by the menu panel. Lines
+# are indented for a <defs> block at column 0; callers nest them further.
+MENU_DEFS = [
+    '  <filter id="noise" x="0%" y="0%" width="100%" height="100%">',
+    '    <feTurbulence type="fractalNoise" baseFrequency="0.65" numOctaves="3" stitchTiles="stitch"/>',
+    '    <feColorMatrix type="matrix" values="1 0 0 0 0  0 1 0 0 0  0 0 1 0 0  0 0 0 0.1 0"/>',
+    '    <feComposite operator="in" in2="SourceGraphic" result="monoNoise"/>',
+    '    <feBlend in="SourceGraphic" in2="monoNoise" mode="multiply" />',
+    '  </filter>',
+    '  <linearGradient id="borderGradient" x1="0%" y1="0%" x2="100%" y2="0%">',
+    '    <stop offset="0%" stop-color="#555" />',
+    '    <stop offset="50%" stop-color="#888" />',
+    '    <stop offset="100%" stop-color="#555" />',
+    '  </linearGradient>',
+]
+
+ICONS = {
+    "moon": "M10,2A8,8 0 1,1 10,18A6,6 0 1,0 10,2Z",
+    "rune": "M10,2L10,18M6,6L14,6M6,12L14,14M10,18L6,16M10,18L14,16",
+    "eye": "M2,10Q10,0 18,10Q10,20 2,10ZM10,10A3,3 0 1,0 10,10.1",
+    "vitality": "M10,18L4,12A4,4 0 0,1 10,6A4,4 0 0,1 16,12Z",
+    "endurance": "M10,2Q16,10 10,18Q4,10 10,2Z",
+    "strength": "M2,10A4,4 0 0,1 6,6L14,4 16,8 12,10 16,14 10,18 2,10Z",
+    "skill": "M8,2L6,10 2,10 4,12 2,16 8,12 12,18 14,8 8,2Z",
+    "bloodtinge": "M10,10m-6,0a6,6 0 1,0 12,0a6,6 0 1,0 -12,0M10,2L10,18M2,10L18,10M4,4L16,16M4,16L16,4",
+    "arcane": "M10,2L12,8 18,8 13,12 15,18 10,14 5,18 7,12 2,8 8,8Z",
+}
+
+ICON_FILLS = {"vitality": "#8b0000", "rune": "#8b0000", "bloodtinge": "#8b0000", "endurance": "#2e8b57", "eye": "#4080a0"}
+
+def num(v):
+    # 12.0 -> "12", 2.5 -> "2.5"
+    return str(int(v)) if float(v).is_integer() else f"{v:g}"
+
+@lru_cache(maxsize=None)
+def serrated_path(width, height, tooth_size=6):
+    # Box with zigzag (stamp-like) edges, teeth pointing inwards
+    half = tooth_size / 2
+    depth = tooth_size / 2
+    pts = [(0, 0)]
+    x, y = 0, 0
+    while x < width:  # Top
+        x = min(x + half, width); pts.append((x, depth))
+        if x >= width: break
+        x = min(x + half, width); pts.append((x, 0))
+    pts.append((width, 0))
+    while y < height:  # Right
+        y = min(y + half, height); pts.append((width - depth, y))
+        if y >= height: break
+        y = min(y + half, height); pts.append((width, y))
+    pts.append((width, height))
+    while x > 0:  # Bottom
+        x = max(x - half, 0); pts.append((x, height - depth))
+        if x <= 0: break
+        x = max(x - half, 0); pts.append((x, height))
+    pts.append((0, height))
+    while y > 0:  # Left
+        y = max(y - half, 0); pts.append((depth, y))
+        if y <= 0: break
+        y = max(y - half, 0); pts.append((0, y))
+    coords = [f"{num(px)},{num(py)}" for px, py in pts]
+    return f"M{coords[0]}L{' '.join(coords[1:])}Z"
+
+@lru_cache(maxsize=None)
+def menu_panel_frame(width, height, tooth_size, inset, indent):
+    # (opening, closing) markup around the panel content; see menu_panel
+    d = serrated_path(width, height, tooth_size)
+    inner_w = width - inset * 2
+    inner_h = height - inset * 2
+    inner = indent + "  "
+    opening = "\n".join([
+        f'{indent}<path d="{d}" fill="#0a0a0a" opacity="0.85" />',
+        f'{indent}<path d="{d}" fill="#111111" filter="url(#noise)" opacity="0.6"/>',
+        f'{indent}<path d="{d}" fill="none" stroke="#333" stroke-width="2" />',
+        f'{indent}<g transform="translate({inset}, {inset})">',
+        f'{inner}<rect x="0" y="0" width="{num(inner_w)}" height="{num(inner_h)}" fill="none" stroke="url(#borderGradient)" stroke-width="3"/>',
+        f'{inner}<rect x="6" y="6" width="{num(inner_w - 12)}" height="{num(inner_h - 12)}" fill="none" stroke="#333" stroke-width="1"/>',
+    ])
+    return opening, f'{indent}</g>'
+
+def menu_panel(width, height, content, tooth_size=12, inset=15, indent=""):
+    # Serrated translucent panel with the double inner frame. `content` is
+    # placed as given inside the inset group, so its coordinates start at the
+    # inner frame; indent it one level (two spaces) deeper than `indent`.
+    opening, closing = menu_panel_frame(width, height, tooth_size, inset, indent)
+    return "\n".join([opening, content, closing])
+
+@lru_cache(maxsize=None)
+def double_line(width, y, margin=10, stroke="#555"):
+    return "\n".join(
+        f'<line x1="{margin}" y1="{num(ly)}" x2="{num(width - margin)}" y2="{num(ly)}" stroke="{stroke}" stroke-width="1" />'
+        for ly in (y, y + 4)
+    )
+
+@lru_cache(maxsize=None)
+def header_divider(width, y):
+    # Double rule with a lens-shaped ornament in the middle
+    mid = width / 2
+    return "\n".join([
+        f'<g transform="translate(0, {num(y)})">',
+        double_line(width, 0),
+        f'<path d="M{num(mid - 30)},2Q{num(mid)},10 {num(mid + 30)},2" stroke="#777" fill="none" />',
+        f'<path d="M{num(mid - 30)},2Q{num(mid)},-6 {num(mid + 30)},2" stroke="#777" fill="none" />',
+        '</g>',
+    ])
+
+@lru_cache(maxsize=None)
+def section_divider(width, y, margin=10):
+    # Single rule with a small swag 4px below it
+    mid = width / 2
+    return "\n".join([
+        f'<line x1="{margin}" y1="{num(y)}" x2="{num(width - margin)}" y2="{num(y)}" stroke="#555" stroke-width="1" />',
+        f'<path d="M{num(mid - 20)},{num(y + 4)}Q{num(mid)},{num(y + 9)} {num(mid + 20)},{num(y + 4)}" stroke="#777" fill="none" />',
+    ])
+
+@lru_cache(maxsize=None)
+def icon_badge(icon, x, y):
+    # Framed 22px stat icon with its top-left corner at (x, y)
+    parts = [f'<rect x="{num(x)}" y="{num(y)}" width="22" height="22" fill="#2a2822" stroke="#5a5540" stroke-width="1"/>']
+    path = ICONS.get(icon)
+    if path:
+        fill = ICON_FILLS.get(icon, "#000")
+        parts.append(f'<path d="{path}" transform="translate({num(x)}, {num(y)}) scale(1.1)" fill="{fill}" stroke="none" />')
+    return "\n".join(parts)
@@ -0,0 +1,36 @@
+import unittest
+
+from timeline import Timeline
+
+def upgrade_sequence(rows):
+    # Same shape as the card: fade in on the first row, land on each, confirm
+    tl = Timeline().hold(1)
+    for i in range(rows):
+        tl.move(40 + i * 30, 0.5, fade_in=(i == 0))
+        tl.land(show=[f"#upg-{i}"], hide=[f"#val-old-{i}"])
+        tl.hold(1)
+    tl.move(300, 0.5).hold(0.5)
+    tl.swap(show=[".val-final"], hide=[".val-initial"])
+    return tl.hold(2)
+
+class TimelineCompileTest(unittest.TestCase):
+    def test_empty_timeline_compiles_to_nothing(self):
+        self.assertEqual(Timeline().compile(), "")
+
+    def test_land_swap_hold(self):
+        tl = upgrade_sequence(1)
+        self.assertAlmostEqual(tl.duration, 5.5)
+        css = tl.compile()
+        self.assertIn("#upg-0 { animation: on 0.01s linear 1.50s forwards, off 0.01s linear 3.50s forwards; }", css)
+        self.assertIn("#val-old-0 { animation: off 0.01s linear 1.50s forwards; }", css)
+        self.assertIn(".val-final { animation: on 0.01s linear 3.50s forwards; }", css)
+        self.assertIn(".val-initial { animation: off 0.01s linear 3.50s forwards; }", css)
+        self.assertIn("#cursor { animation: anim-cursor 5.50s linear forwards; }", css)
+
+    def test_keyframe_blocks_shared_across_rows(self):
+        for rows in (1, 6):
+            css = upgrade_sequence(rows).compile()
+            self.assertEqual(css.count("@keyframes"), 3)  # on, off, anim-cursor
+
+if __name__ == "__main__":
+    unittest.main()
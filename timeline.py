@@ -0,0 +1,91 @@
+# Small animation timeline engine for the stats overlay.
+#
+# Events are declared once in order (cursor moves, holds, visibility switches)
+# and compiled to CSS. Every on/off switch shares the same two keyframe blocks;
+# only the animation-delay differs per element, so the @keyframes CSS does not
+# grow with the number of changed stats. The rest still does: one animation
+# rule per switched selector and two cursor keyframe stops per move.
+
+SWITCH_DURATION = 0.01  # seconds; an on/off switch is effectively instant
+
+SHARED_KEYFRAMES = {
+    "on": "@keyframes on { from { opacity: 0; } to { opacity: 1; } }",
+    "off": "@keyframes off { from { opacity: 1; } to { opacity: 0; } }",
+}
+
+class Timeline:
+    def __init__(self, cursor_selector="#cursor"):
+        self.t = 0.0
+        self.cursor_selector = cursor_selector
+        self.cursor = []    # (time, opacity, y)
+        self.switches = {}  # selector -> [(keyframe name, time)]
+        self.landed = []    # selectors shown by land(), hidden again by swap()
+        self.cursor_y = 0
+        self.cursor_opacity = 0
+
+    # --- Events -------------------------------------------------------
+    def hold(self, seconds):
+        self.t += seconds
+        return self
+
+    def move(self, y, seconds, fade_in=False):
+        # Cursor slides from its current row to `y`. With fade_in it appears
+        # at the target instead of sliding (first row).
+        start_y = y if fade_in else self.cursor_y
+        self.cursor.append((self.t, self.cursor_opacity, start_y))
+        self.t += seconds
+        self.cursor_y, self.cursor_opacity = y, 1
+        self.cursor.append((self.t, 1, y))
+        return self
+
+    def land(self, show=(), hide=()):
+        # Row reached: flip visibility of the given selectors at the current time
+        for sel in show:
+            self.switch(sel, "on")
+            self.landed.append(sel)
+        for sel in hide:
+            self.switch(sel, "off")
+        return self
+
+    def swap(self, show=(), hide=()):
+        # Global value swap (Confirm pressed): like land, and everything the
+        # rows revealed is hidden again
+        for sel in show:
+            self.switch(sel, "on")
+        for sel in list(hide) + self.landed:
+            self.switch(sel, "off")
+        self.landed = []
+        return self
+
+    def switch(self, selector, name):
+        self.switches.setdefault(selector, []).append((name, self.t))
+        return self
+
+    @property
+    def duration(self):
+        return self.t
+
+    # --- Compilation --------------------------------------------------
+    def compile(self):
+        # Returns the CSS body (without <style> tags); "" when nothing animates
+        total = self.duration
+        if total <= 0:
+            return ""
+
+        css = []
+        used = sorted({name for events in self.switches.values() for name, _ in events})
+        for name in used:
+            css.append(SHARED_KEYFRAMES[name])
+        for selector, events in self.switches.items():
+            anims = ", ".join(f"{name} {SWITCH_DURATION}s linear {at:.2f}s forwards" for name, at in events)
+            css.append(f"{selector} {{ animation: {anims}; }}")
+
+        if self.cursor:
+            frames = [f"0% {{ opacity: 0; transform: translate(0, {self.cursor[0][2]}px); }}"]
+            for at, opacity, y in self.cursor:
+                frames.append(f"{at / total * 100:.2f}% {{ opacity: {opacity}; transform: translate(0, {y}px); }}")
+            frames.append(f"100% {{ opacity: {self.cursor_opacity}; transform: translate(0, {self.cursor_y}px); }}")
+            css.append(f"@keyframes anim-cursor {{ {' '.join(frames)} }}")
+            css.append(f"{self.cursor_selector} {{ animation: anim-cursor {total:.2f}s linear forwards; }}")
+
+        return "\n".join(css) + "\n"
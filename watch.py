@@ -0,0 +1,146 @@
+# Watch mode for theme work: re-render on change and serve preview.html with
+# auto-reload.
+#
+# Frame inputs (the GIF and the frame-stage functions: decode, sampling,
+# resize, occlusion, encode) trigger a full re-encode. Overlay inputs (the stats
+# history file and the renderer sources) reload the renderer and rebuild the
+# SVG, border and frame CSS around the already-encoded frames. render_svg.py
+# and ornaments.py edits regenerate bloodborne_menu.svg.
+import os
+import time
+import runpy
+import inspect
+import threading
+import importlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import timeline
+import ornaments
+import convert_gif_to_svg as conv
+
+MENU_SCRIPT = "render_svg.py"
+PREVIEW_PAGE = "preview.html"
+PREVIEW_SVG = "bloodborne_animated_hq.svg"  # image preview.html points at
+# Functions whose edits change the encoded frames, not just the SVG around them
+FRAME_STAGE = ["load_frames", "motion_energy", "select_motion_frames", "kept_frame_durations",
+               "sample_indices", "sample_frames", "resize_pyramid", "cached_frame_levels",
+               "menu_geometry", "occluded_box", "occlude_frames", "encode_frame", "encode_frames",
+               "prepare_frames"]
+
+# Polls /__version and reloads the page when a render finishes
+RELOAD_SCRIPT = """<script>
+(function () {
+    var seen = null;
+    setInterval(function () {
+        fetch('/__version', {cache: 'no-store'}).then(function (r) { return r.text(); }).then(function (v) {
+            if (seen !== null && v !== seen) location.reload();
+            seen = v;
+        }).catch(function () {});
+    }, 500);
+})();
+</script>
+"""
+
+class PreviewHandler(SimpleHTTPRequestHandler):
+    state = None  # shared {"version": int, "preview": path of the SVG to show}
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/__version":
+            return self.send_text(str(self.state["version"]), "text/plain")
+        if path in ("/", "/" + PREVIEW_PAGE):
+            with open(PREVIEW_PAGE, 'r', encoding='utf-8') as f:
+                html = f.read()
+            html = html.replace(f'src="{PREVIEW_SVG}"', f'src="{self.state["preview"]}"')
+            return self.send_text(html.replace("</body>", RELOAD_SCRIPT + "</body>"), "text/html")
+        return super().do_GET()
+
+    def send_text(self, text, content_type):
+        body = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+def serve_preview(state, port):
+    PreviewHandler.state = state
+    server = ThreadingHTTPServer(("127.0.0.1", port), partial(PreviewHandler, directory=os.getcwd()))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Preview: http://localhost:{port}/{PREVIEW_PAGE}")
+    return server
+
+def frame_signature(input_path):
+    # Call after reloading conv so the sources are those of the loaded module
+    return (mtime(input_path),) + tuple(inspect.getsource(getattr(conv, name)) for name in FRAME_STAGE)
+
+def watch(input_path, output_path, widths, variant_names=False, port=8000, interval=0.5, **frame_options):
+    # Stats are fetched once, in the background while the first frames encode;
+    # the history file is re-read on every change so editing it previews the
+    # upgrade animation. History is never written here.
+    outputs = conv.output_paths(output_path, widths, variant_names)
+    # The page shows the widest variant (the one laid out at reference scale)
+    preview = os.path.relpath(outputs[max(outputs)]).replace(os.sep, "/")
+    state = {"version": 0, "preview": preview}
+    server = serve_preview(state, port)
+    io_pool = ThreadPoolExecutor(max_workers=1)
+    stats_future = io_pool.submit(conv.fetch_current_stats)
+
+    prepared = None  # prepare_frames output; outlives module reloads
+    seen = {}
+    try:
+        while True:
+            frame_sig = seen.get("frames")
+            overlay_sig = (mtime(conv.HISTORY_FILE),) + tuple(mtime(conv.source_path(src)) for src in conv.RENDER_SOURCES)
+            menu_sig = (mtime(conv.source_path(MENU_SCRIPT)), mtime(conv.source_path("ornaments.py")))
+            changed = False
+            try:
+                if overlay_sig != seen.get("overlay") and "overlay" in seen:
+                    print("Overlay inputs changed, reloading renderer...")
+                    importlib.reload(timeline)
+                    importlib.reload(ornaments)
+                    importlib.reload(conv)
+                frame_sig = frame_signature(input_path)
+                if frame_sig != seen.get("frames"):
+                    print("Frame inputs changed, encoding frames...")
+                    prepared = None
+                    prepared = conv.prepare_frames(input_path, widths, **frame_options)
+                if prepared and (frame_sig != seen.get("frames") or overlay_sig != seen.get("overlay")):
+                    # Assets are rebuilt with the reloaded module so border,
+                    # frame CSS and header edits show up, not just the overlay
+                    encoded, frame_durations, heights = prepared
+                    current_stats = stats_future.result()
+                    history_stats = conv.load_history() or current_stats.copy()
+                    for width, path in outputs.items():
+                        asset = conv.BackgroundAsset(encoded[width], frame_durations, width, heights[width])
+                        with open(path, 'wb') as f:
+                            f.write(asset.render(current_stats, history_stats))
+                        print(f"Rendered {path}")
+                    changed = True
+                if menu_sig != seen.get("menu") and "menu" in seen:
+                    runpy.run_path(conv.source_path(MENU_SCRIPT), run_name="__main__")
+                    changed = True
+            except Exception as e:
+                # Keep watching through half-finished edits; the next save retries
+                print(f"Render Error: {e}")
+            seen.update(frames=frame_sig, overlay=overlay_sig, menu=menu_sig)
+            if changed:
+                state["version"] += 1
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopping watch mode.")
+    finally:
+        server.shutdown()
+        io_pool.shutdown(wait=False)